@@ -0,0 +1,52 @@
+"""Import app for benchmarks and tests without the UI and NLP stack.
+
+The processing classes need only the standard library and requests. Packages
+from requirements.txt that are not installed (Streamlit, python-docx, spaCy,
+...) are replaced by empty stand-ins before app is imported, installed ones
+are used as they are.
+
+Usage: import app_import  (before the first "from app import ...")
+"""
+import importlib.util
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+OPTIONAL_MODULES = (
+    'streamlit',
+    'docx', 'docx.oxml', 'docx.oxml.ns', 'docx.shared', 'docx.enum', 'docx.enum.text',
+    'tqdm',
+    'pandas',
+    'numpy',
+    'sklearn', 'sklearn.feature_extraction', 'sklearn.feature_extraction.text',
+    'nltk', 'nltk.corpus', 'nltk.stem', 'nltk.tokenize',
+    'spacy',
+    'sentence_transformers',
+    'gensim', 'gensim.models', 'gensim.models.phrases',
+    'PIL', 'PIL.Image',
+)
+
+
+def _installed(package):
+    try:
+        return importlib.util.find_spec(package) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+for name in OPTIONAL_MODULES:
+    if name not in sys.modules and not _installed(name.split('.')[0]):
+        sys.modules[name] = MagicMock(name=name)
+
+# No script run, no session: reading a session value fails as in bare Streamlit
+if isinstance(sys.modules.get('streamlit'), MagicMock):
+    sys.modules['streamlit'].session_state = SimpleNamespace()
+
+# Styles, the LTWA table and the caches are resolved against the working directory
+os.chdir(REPO_DIR)
+sys.path.insert(0, str(REPO_DIR))
+
+import app  # noqa: E402,F401
@@ -0,0 +1,136 @@
+"""Throughput of format_many against formatting records one at a time.
+
+Usage: python benchmarks/format_many.py [records ...]
+       python benchmarks/format_many.py --scaling [records ...]
+
+--scaling compares in-process format_many with the spawn process pool for
+batches of 10k-100k records and 1, 2 and Config.FORMAT_PROCESS_WORKERS processes.
+"""
+import os
+import random
+import sys
+import time
+
+import app_import  # noqa: F401  Puts the repo on sys.path, stands in for missing packages
+
+from app import BatchFormatter, Config, format_many
+
+DEFAULT_SIZES = (1000, 10000, 50000)  # Config.MAX_REFERENCES caps a job at 1000
+SCALING_SIZES = (10000, 25000, 50000, 100000)
+PRESET_FLAGS = ('gost_style', 'acs_style', 'rsc_style', 'cta_style', 'style5', 'style6', 'style7', 'style8', 'style9', 'style10')
+CUSTOM_ELEMENTS = [
+    ('Authors', {'italic': False, 'bold': False, 'parentheses': False, 'separator': '. '}),
+    ('Title', {'italic': False, 'bold': False, 'parentheses': False, 'separator': ' // '}),
+    ('Journal', {'italic': True, 'bold': False, 'parentheses': False, 'separator': '. '}),
+    ('Year', {'italic': False, 'bold': False, 'parentheses': False, 'separator': '. '}),
+    ('Volume', {'italic': False, 'bold': True, 'parentheses': False, 'separator': ', '}),
+    ('Pages', {'italic': False, 'bold': False, 'parentheses': False, 'separator': '. '}),
+    ('DOI', {'italic': False, 'bold': False, 'parentheses': False, 'separator': ''}),
+]
+GIVEN_NAMES = ['Anna', 'Jean-Pierre', 'Wei', 'María José', 'Olga', 'Hans Peter', 'Li', "D'Arcy"]
+FAMILY_NAMES = ['Ivanova', 'Smith', "O'Neil", 'Zhang', 'Müller', 'García-López', 'Kowalski', 'Nguyen']
+JOURNALS = ['Journal of Applied Physics', 'Advanced Materials', 'Physical Review B',
+            'Journal of the American Chemical Society', 'Nano Letters', 'Electrochimica Acta']
+WORDS = ['synthesis', 'of', 'layered', 'oxide', 'cathodes', 'for', 'sodium-ion', 'batteries',
+         'and', 'their', 'electrochemical', 'performance', 'at', 'high', 'rates']
+
+
+def make_records(count, seed=0):
+    """Synthetic resolved metadata with realistic field shapes"""
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        first_page = rng.randint(1, 2000)
+        records.append({
+            'title': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(5, 14))).capitalize(),
+            'authors': [{'given': rng.choice(GIVEN_NAMES), 'family': rng.choice(FAMILY_NAMES)}
+                        for _ in range(rng.randint(1, 12))],
+            'journal': rng.choice(JOURNALS),
+            'year': rng.randint(1990, 2025),
+            'volume': str(rng.randint(1, 150)),
+            'issue': str(rng.randint(1, 24)) if rng.random() < 0.7 else '',
+            'pages': f"{first_page}-{first_page + rng.randint(1, 30)}" if rng.random() < 0.8 else '',
+            'article_number': '' if rng.random() < 0.8 else f"e{rng.randint(1000, 99999)}",
+            'doi': f"10.{rng.randint(1000, 9999)}/bench.{i}",
+        })
+    return records
+
+
+def style_config(preset=None):
+    """Style settings as the style panel stores them; preset is one of PRESET_FLAGS"""
+    config = {
+        'author_format': 'Smith, A.A.',
+        'author_separator': ', ',
+        'et_al_limit': 3,
+        'use_and_bool': False,
+        'use_ampersand_bool': True,
+        'doi_format': 'https://doi.org/10.10/xxx',
+        'doi_hyperlink': True,
+        'page_format': '122–128',
+        'final_punctuation': '.',
+        'numbering_style': '1.',
+        'journal_style': '{J. Abbr.}',
+        'elements': [] if preset else CUSTOM_ELEMENTS,
+    }
+    config.update({flag: flag == preset for flag in PRESET_FLAGS})
+    return config
+
+
+def as_text(results):
+    return [rendered if isinstance(rendered, str) else rendered.to_markdown() for rendered, _ in results]
+
+
+def scaling(sizes):
+    """In-process format_many against the process pool, every pool run starts its own workers"""
+    process_counts = sorted({2, Config.FORMAT_PROCESS_WORKERS} - {1})
+    config = style_config('gost_style')
+    print(f"CPUs: {os.cpu_count()}  process threshold: {Config.FORMAT_PROCESS_THRESHOLD}  "
+          f"chunk: {Config.FORMAT_CHUNK_SIZE}")
+
+    for size in sizes:
+        records = make_records(size)
+
+        start = time.perf_counter()
+        expected = as_text(format_many(records, config, processes=1))
+        in_process = time.perf_counter() - start
+        print(f"{size:7} refs  in-process   {in_process:6.2f} s  {size / in_process:8.0f} refs/s")
+
+        for processes in process_counts:
+            start = time.perf_counter()
+            results = as_text(format_many(records, config, processes=processes))
+            elapsed = time.perf_counter() - start
+
+            mismatches = sum(1 for a, b in zip(results, expected) if a != b) + abs(len(results) - len(expected))
+            print(f"{size:7} refs  {processes:2} processes {elapsed:6.2f} s  {size / elapsed:8.0f} refs/s  "
+                  f"speedup {in_process / elapsed:4.2f}x  mismatches {mismatches}")
+
+
+def main():
+    args = sys.argv[1:]
+    if '--scaling' in args:
+        scaling([int(arg) for arg in args if arg != '--scaling'] or SCALING_SIZES)
+        return
+
+    sizes = [int(arg) for arg in args] or DEFAULT_SIZES
+
+    for style in ('custom', 'gost_style', 'acs_style'):
+        config = style_config(None if style == 'custom' else style)
+        for size in sizes:
+            records = make_records(size)
+
+            # One record per call: the style is looked up for every reference
+            start = time.perf_counter()
+            single = [result for record in records for result in BatchFormatter.format_chunk([record], config)]
+            single_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            results = format_many(records, config)
+            elapsed = time.perf_counter() - start
+
+            mismatches = sum(1 for a, b in zip(as_text(results), as_text(single)) if a != b)
+            print(f"{style:10} {size:7} refs  one at a time {single_elapsed:6.2f} s  format_many {elapsed:6.2f} s  "
+                  f"{size / elapsed:8.0f} refs/s  speedup {single_elapsed / elapsed:4.2f}x  mismatches {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""DOI discovery and metadata fetching replayed from a recorded Crossref/OpenAlex session.
+
+Usage: python benchmarks/http_replay.py [--record]
+
+Requests are answered from benchmarks/cassettes with the recorded latency,
+CITATION_REPLAY_LATENCY_SCALE and CITATION_REPLAY_LATENCY_MS adjust it.
+The DOI picked for a reference does not depend on which search answers
+first (a matching Crossref candidate is preferred over OpenAlex), so every
+scale replays the same DOI and metadata requests.
+--record queries the live APIs once and rewrites the cassettes.
+"""
+import concurrent.futures
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+CASSETTE_DIR = BENCHMARKS_DIR / "cassettes"
+REFERENCES_PATH = BENCHMARKS_DIR / "fixtures" / "http_session_references.txt"
+RECORD = '--record' in sys.argv[1:]
+REPLAY_ROUNDS = 3
+
+# The transport mode is read from the environment when app is imported
+os.environ['CITATION_HTTP_MODE'] = 'record' if RECORD else 'replay'
+os.environ['CITATION_CASSETTE_DIR'] = str(CASSETTE_DIR)
+
+import app_import  # noqa: F401  Puts the repo on sys.path, stands in for missing packages
+
+from app import Config, DOICache, DOIProcessor
+
+
+def load_references(path=REFERENCES_PATH):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def run_session(references, cache_dir):
+    """One job against an empty DOI cache: discovery, then metadata for the found DOI"""
+    processor = DOIProcessor()
+    processor.cache = DOICache(str(Path(cache_dir) / "doi_cache.db"))
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=Config.DOI_SEARCH_WORKERS) as executor:
+        dois = list(executor.map(processor.find_doi_enhanced, references))
+    search_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    metadata = processor.extract_metadata_batch_with_cache([doi for doi in dois if doi])
+    metadata_elapsed = time.perf_counter() - start
+
+    return dois, metadata, search_elapsed, metadata_elapsed
+
+
+def main():
+    references = load_references()
+    rounds = 1 if RECORD else REPLAY_ROUNDS
+    print(f"Mode: {Config.HTTP_MODE}  references: {len(references)}  cassettes: {CASSETTE_DIR}")
+
+    baseline = None
+    for round_number in range(1, rounds + 1):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            dois, metadata, search_elapsed, metadata_elapsed = run_session(references, cache_dir)
+
+        resolved = {doi: record.get('title') for doi, record in metadata.items() if record}
+        if baseline is None:
+            baseline = (dois, resolved)
+        mismatches = sum(1 for a, b in zip(dois, baseline[0]) if a != b) + (resolved != baseline[1])
+
+        print(f"round {round_number}  DOI found {sum(1 for doi in dois if doi):3}/{len(references)}  "
+              f"metadata {len(resolved):3}  search {search_elapsed:6.2f} s  metadata {metadata_elapsed:6.2f} s  "
+              f"total {search_elapsed + metadata_elapsed:6.2f} s  mismatches {mismatches}")
+
+    print(f"Cassettes: {len(list(CASSETTE_DIR.glob('*.json.gz')))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Precision/recall and speed of the local reference-likeness classifier.
+
+Two cut-offs are measured: looks_like_reference locates the reference list in a
+manuscript, is_search_candidate decides whether a paragraph gets a DOI search.
+
+Usage: python benchmarks/reference_likeness.py
+"""
+import csv
+import time
+from pathlib import Path
+
+import app_import  # noqa: F401  Puts the repo on sys.path, stands in for missing packages
+
+from app import Config, reference_scanner
+
+FIXTURES_PATH = Path(__file__).resolve().parent / "fixtures" / "reference_likeness.tsv"
+TIMING_ROUNDS = 200
+
+
+def load_fixtures(path=FIXTURES_PATH):
+    """Labeled paragraphs: (is_reference, text)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f, delimiter='\t', quoting=csv.QUOTE_NONE)
+        return [(row['label'] == '1', row['text']) for row in reader]
+
+
+def evaluate(samples, predicate=reference_scanner.looks_like_reference):
+    """Confusion counts and misclassified samples"""
+    true_positive = false_positive = false_negative = true_negative = 0
+    mistakes = []
+
+    for is_reference, text in samples:
+        predicted = predicate(text)
+        if predicted and is_reference:
+            true_positive += 1
+        elif predicted:
+            false_positive += 1
+            mistakes.append(('FP', reference_scanner.reference_score(text), text))
+        elif is_reference:
+            false_negative += 1
+            mistakes.append(('FN', reference_scanner.reference_score(text), text))
+        else:
+            true_negative += 1
+
+    precision = true_positive / (true_positive + false_positive) if true_positive + false_positive else 0.0
+    recall = true_positive / (true_positive + false_negative) if true_positive + false_negative else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1, mistakes
+
+
+def time_per_paragraph(samples, rounds=TIMING_ROUNDS):
+    """Mean classification time in microseconds"""
+    texts = [text for _, text in samples]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            reference_scanner.looks_like_reference(text)
+    return (time.perf_counter() - start) / (rounds * len(texts)) * 1e6
+
+
+def main():
+    samples = load_fixtures()
+    print(f"Samples: {len(samples)} ({sum(1 for label, _ in samples if label)} references)")
+    print(f"Time per paragraph: {time_per_paragraph(samples):.1f} µs")
+
+    for name, threshold, predicate in (
+        ('Reference list', Config.REFERENCE_SCORE_THRESHOLD, reference_scanner.looks_like_reference),
+        ('DOI search', Config.REFERENCE_SEARCH_MIN_SCORE, reference_scanner.is_search_candidate),
+    ):
+        precision, recall, f1, mistakes = evaluate(samples, predicate)
+        print(f"{name} (threshold {threshold}): Precision: {precision:.3f}  Recall: {recall:.3f}  F1: {f1:.3f}")
+
+        for kind, score, text in mistakes:
+            print(f"  {kind} score={score:.1f}: {text[:90]}")
+
+
+if __name__ == "__main__":
+    main()
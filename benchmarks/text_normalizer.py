@@ -0,0 +1,152 @@
+"""Output equivalence and speed of TextNormalizer against the previous per-call cleanup.
+
+Usage: python benchmarks/text_normalizer.py
+"""
+import csv
+import html
+import random
+import re
+import time
+from pathlib import Path
+
+import app_import  # noqa: F401  Puts the repo on sys.path, stands in for missing packages
+
+from app import TextNormalizer
+
+FIXTURES_PATH = Path(__file__).resolve().parent / "fixtures" / "metadata_text.tsv"
+RECORDS = 20000
+AUTHORS_PER_RECORD = 6
+
+
+def legacy_normalize_name(name):
+    """DOIProcessor._normalize_name before TextNormalizer"""
+    if not name:
+        return ''
+
+    if '-' in name or "'" in name or '’' in name:
+        parts = re.split(r'([-\'’])', name)
+        normalized_parts = []
+
+        for i, part in enumerate(parts):
+            if part in ['-', "'", '’']:
+                normalized_parts.append(part)
+            else:
+                if part:
+                    normalized_parts.append(part[0].upper() + part[1:].lower() if len(part) > 1 else part.upper())
+
+        return ''.join(normalized_parts)
+    else:
+        if len(name) > 1:
+            return name[0].upper() + name[1:].lower()
+        else:
+            return name.upper()
+
+
+def legacy_clean_text(text):
+    """DOIProcessor._clean_text before TextNormalizer"""
+    if not text:
+        return ""
+
+    text = text.replace('<sub>', '«SUB»').replace('</sub>', '«/SUB»')
+    text = text.replace('<i>', '«I»').replace('</i>', '«/I»')
+    text = text.replace('<scp>', '«SCP»').replace('</scp>', '«/SCP»')
+    text = text.replace('<SUP>', '«SUP»').replace('</SUP>', '«/SUP»')
+    text = text.replace('<sup>', '«SUP»').replace('</sup>', '«/SUP»')
+
+    text = re.sub(r'<[^>]+>', '', text)
+
+    text = text.replace('«SUB»', '<sub>').replace('«/SUB»', '</sub>')
+    text = text.replace('«I»', '<i>').replace('«/I»', '</i>')
+    text = text.replace('«SCP»', '').replace('«/SCP»', '')
+    text = text.replace('«SUP»', '<sup>').replace('«/SUP»', '</sup>')
+
+    text = html.unescape(text)
+    text = re.sub(r'&[^;]+;', '', text)
+
+    text = text.replace('\n', ' ').replace('\r', '')
+    text = re.sub(r'\s+', ' ', text)
+    text = text.strip()
+
+    if text and (text.isupper() or sum(1 for c in text if c.isupper()) > len(text) * 0.7):
+        text = text.title()
+        corrections = {
+            ' A ': ' a ', ' An ': ' an ', ' The ': ' the ', ' And ': ' and ',
+            ' But ': ' but ', ' Or ': ' or ', ' For ': ' for ', ' Nor ': ' nor ',
+            ' On ': ' on ', ' At ': ' at ', ' To ': ' to ', ' By ': ' by ',
+            ' In ': ' in ', ' Of ': ' of ', ' With ': ' with ', ' As ': ' as ',
+            ' Is ': ' is ', ' Via ': ' via ', ' Vs ': ' vs ', ' Vs. ': ' vs. ',
+            ' Etc ': ' etc ', ' Etc. ': ' etc. ',
+        }
+        for wrong, correct in corrections.items():
+            text = text.replace(wrong, correct)
+            text = text.replace(wrong.upper(), correct)
+
+    return text
+
+
+def load_fixtures(path=FIXTURES_PATH):
+    """Field samples grouped by kind: title, journal, name"""
+    samples = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f, delimiter='\t', quoting=csv.QUOTE_NONE):
+            samples.setdefault(row['field'], []).append(row['text'])
+    return samples
+
+
+def build_corpus(samples, records=RECORDS, seed=1):
+    """Record stream: unique titles, journals and author names repeating as in real batches"""
+    rng = random.Random(seed)
+    texts, names = [], []
+    for number in range(records):
+        texts.append(f"{rng.choice(samples['title'])} {number}")
+        texts.append(rng.choice(samples['journal']))
+        names.extend(rng.choice(samples['name']) for _ in range(AUTHORS_PER_RECORD))
+    return texts, names
+
+
+def check_equivalence(samples, normalizer):
+    """Fixture fields whose output differs from the legacy implementation"""
+    mismatches = []
+    for kind, values in samples.items():
+        for value in values:
+            if kind == 'name':
+                expected, actual = legacy_normalize_name(value), normalizer.normalize_name(value)
+            else:
+                expected, actual = legacy_clean_text(value), normalizer.clean_text(value)
+            if expected != actual:
+                mismatches.append((value, expected, actual))
+    return mismatches
+
+
+def time_pass(clean_text, normalize_name, texts, names):
+    start = time.perf_counter()
+    for text in texts:
+        clean_text(text)
+    for name in names:
+        normalize_name(name)
+    return time.perf_counter() - start
+
+
+def main():
+    samples = load_fixtures()
+    mismatches = check_equivalence(samples, TextNormalizer())
+    texts, names = build_corpus(samples)
+
+    legacy = time_pass(legacy_clean_text, legacy_normalize_name, texts, names)
+    uncached = TextNormalizer()
+    compiled = time_pass(uncached._clean_text, uncached._normalize_name, texts, names)
+    normalizer = TextNormalizer()
+    cached = time_pass(normalizer.clean_text, normalizer.normalize_name, texts, names)
+
+    calls = len(texts) + len(names)
+    print(f"Records: {RECORDS} ({len(texts)} titles/journals, {len(names)} author names)")
+    print(f"Fixture mismatches: {len(mismatches)}")
+    for value, expected, actual in mismatches:
+        print(f"  {value!r}: {expected!r} != {actual!r}")
+    print(f"Legacy:            {legacy * 1e6 / calls:6.2f} µs/call")
+    print(f"Compiled:          {compiled * 1e6 / calls:6.2f} µs/call  ({legacy / compiled:.1f}x)")
+    print(f"Compiled + LRU:    {cached * 1e6 / calls:6.2f} µs/call  ({legacy / cached:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""app is imported through benchmarks/app_import.py, missing UI and NLP packages are stubbed"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+import app_import  # noqa: E402,F401
@@ -0,0 +1,50 @@
+import threading
+import time
+
+import app
+from app import JobDeadline, ReferenceProcessor
+
+
+def wait_for(condition, timeout=2):
+    stop = time.monotonic() + timeout
+    while not condition() and time.monotonic() < stop:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_stragglers_are_handed_over_not_resubmitted(monkeypatch):
+    release = threading.Event()
+    searches = []
+    metadata = []
+    lock = threading.Lock()
+
+    def straggler(reference, deadline):
+        release.wait(2)
+        return f"10.1/{reference}"
+
+    def find_doi_by_search(self, reference, deadline=None):
+        with lock:
+            searches.append(reference)
+        return f"10.1/{reference}"
+
+    def extract_metadata_with_cache(self, doi):
+        with lock:
+            metadata.append(doi)
+
+    monkeypatch.setattr(app.DOIProcessor, 'find_doi_by_search', find_doi_by_search)
+    monkeypatch.setattr(app.DOIProcessor, 'extract_metadata_with_cache', extract_metadata_with_cache)
+
+    processor = ReferenceProcessor()
+    pending = processor._run_until_deadline(straggler, {0: 'running', 1: 'queued'}, 1,
+                                            lambda key, future: None, JobDeadline(0.05))
+
+    assert set(pending) == {0, 1}
+    assert not pending[0].done() and pending[1].cancelled()
+
+    ReferenceProcessor._continue_in_background({'running': pending[0], 'queued': pending[1]}, [])
+    release.set()
+
+    assert wait_for(lambda: len(metadata) == 2)
+    # The running search is followed to its end, only the cancelled one is searched again
+    assert searches == ['queued']
+    assert sorted(metadata) == ['10.1/queued', '10.1/running']
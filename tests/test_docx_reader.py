@@ -0,0 +1,193 @@
+import io
+import xml.etree.ElementTree as ET
+import zipfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+import pytest
+
+import app_import
+from app import docx_reader, extract_docx_references
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+R_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+PART_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml'
+REL_TYPE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+REFERENCES = (Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures"
+              / "http_session_references.txt").read_text(encoding='utf-8').splitlines()
+
+
+def make_docx(body: str, numbering: str = None, styles: str = None) -> bytes:
+    """Minimal DOCX package around a w:body fragment and optional numbering/styles fragments"""
+    parts = {'document': ('word/document.xml', f'{PART_TYPE}.document.main+xml',
+                          f'<w:document xmlns:w="{W_NS}" xmlns:r="{R_NS}"><w:body>{body}<w:sectPr/></w:body></w:document>')}
+    if numbering is not None:
+        parts['numbering'] = ('word/numbering.xml', f'{PART_TYPE}.numbering+xml',
+                              f'<w:numbering xmlns:w="{W_NS}">{numbering}</w:numbering>')
+    if styles is not None:
+        parts['styles'] = ('word/styles.xml', f'{PART_TYPE}.styles+xml',
+                           f'<w:styles xmlns:w="{W_NS}">{styles}</w:styles>')
+
+    overrides = ''.join(f'<Override PartName="/{name}" ContentType="{content_type}"/>'
+                        for name, content_type, _ in parts.values())
+    document_rels = ''.join(f'<Relationship Id="rId{i}" Type="{REL_TYPE}/{kind}" Target="{kind}.xml"/>'
+                            for i, kind in enumerate(parts) if kind != 'document')
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('[Content_Types].xml',
+                         '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                         '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                         f'<Default Extension="xml" ContentType="application/xml"/>{overrides}</Types>')
+        archive.writestr('_rels/.rels', f'<Relationships xmlns="{REL_NS}"><Relationship Id="rId1" '
+                                        f'Type="{REL_TYPE}/officeDocument" Target="word/document.xml"/></Relationships>')
+        archive.writestr('word/_rels/document.xml.rels', f'<Relationships xmlns="{REL_NS}">{document_rels}</Relationships>')
+        for name, _, xml in parts.values():
+            archive.writestr(name, xml)
+    return buffer.getvalue()
+
+
+def paragraph(text: str, properties: str = '') -> str:
+    return f'<w:p><w:pPr>{properties}</w:pPr><w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>'
+
+
+def numbered(text: str, num_id: str = None, ilvl: str = None, style: str = None) -> str:
+    properties = f'<w:pStyle w:val="{style}"/>' if style else ''
+    if num_id is not None or ilvl is not None:
+        properties += ('<w:numPr>' + (f'<w:ilvl w:val="{ilvl}"/>' if ilvl is not None else '')
+                       + (f'<w:numId w:val="{num_id}"/>' if num_id is not None else '') + '</w:numPr>')
+    return paragraph(text, properties)
+
+
+def level(ilvl: int, lvl_text: str, num_fmt: str = 'decimal', start: int = 1) -> str:
+    return (f'<w:lvl w:ilvl="{ilvl}"><w:start w:val="{start}"/><w:numFmt w:val="{num_fmt}"/>'
+            f'<w:lvlText w:val="{lvl_text}"/></w:lvl>')
+
+
+def legacy_paragraph_texts(source: bytes):
+    """Paragraph.text of python-docx for the body paragraphs, the path before DocxParagraphReader"""
+    W = '{%s}' % W_NS
+    with zipfile.ZipFile(io.BytesIO(source)) as archive:
+        body = ET.fromstring(archive.read('word/document.xml')).find(f'{W}body')
+
+    texts = []
+    for p in body.findall(f'{W}p'):
+        runs = [run for child in p for run in
+                ([child] if child.tag == f'{W}r' else child.findall(f'{W}r') if child.tag == f'{W}hyperlink' else [])]
+        parts = []
+        for run in runs:
+            for child in run:
+                if child.tag == f'{W}t':
+                    parts.append(child.text or '')
+                elif child.tag in (f'{W}tab', f'{W}ptab'):
+                    parts.append('\t')
+                elif child.tag in (f'{W}br', f'{W}cr'):
+                    parts.append('\n')
+                elif child.tag == f'{W}noBreakHyphen':
+                    parts.append('-')
+        texts.append(''.join(parts))
+    return texts
+
+
+def python_docx_texts(source: bytes):
+    from docx import Document
+    return [para.text for para in Document(io.BytesIO(source)).paragraphs]
+
+
+RUNS_BODY = (
+    '<w:p><w:r><w:t>Smith J., </w:t></w:r><w:r><w:rPr><w:i/></w:rPr><w:t xml:space="preserve">Polymer </w:t></w:r>'
+    '<w:r><w:t>electrolytes</w:t><w:tab/><w:t>//</w:t><w:br/><w:t>J. Power Sources</w:t></w:r></w:p>'
+    '<w:p><w:r><w:t xml:space="preserve">See </w:t></w:r><w:hyperlink r:id="rId9"><w:r><w:t>https://doi.org/10.1/x</w:t>'
+    '</w:r></w:hyperlink><w:r><w:t xml:space="preserve"> and co</w:t><w:noBreakHyphen/><w:t>workers.</w:t></w:r></w:p>'
+    '<w:tbl><w:tr><w:tc><w:p><w:r><w:t>Table cell</w:t></w:r></w:p></w:tc></w:tr></w:tbl>'
+    '<w:p/>'
+)
+NUMBERING = (
+    f'<w:abstractNum w:abstractNumId="0">{level(0, "%1.")}{level(1, "%1.%2", "lowerLetter")}</w:abstractNum>'
+    f'<w:abstractNum w:abstractNumId="1">{level(0, "[%1]")}</w:abstractNum>'
+    '<w:num w:numId="1"><w:abstractNumId w:val="0"/></w:num>'
+    '<w:num w:numId="2"><w:abstractNumId w:val="1"/></w:num>'
+    '<w:num w:numId="3"><w:abstractNumId w:val="0"/>'
+    '<w:lvlOverride w:ilvl="0"><w:startOverride w:val="5"/></w:lvlOverride></w:num>'
+    f'<w:num w:numId="4"><w:abstractNumId w:val="0"/><w:lvlOverride w:ilvl="0">{level(0, "(%1)", "upperRoman", 2)}'
+    '</w:lvlOverride></w:num>'
+)
+STYLES = (
+    '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/></w:style>'
+    '<w:style w:type="paragraph" w:styleId="ListBase"><w:basedOn w:val="Normal"/>'
+    '<w:pPr><w:numPr><w:numId w:val="2"/></w:numPr></w:pPr></w:style>'
+    '<w:style w:type="paragraph" w:styleId="Bibliography"><w:basedOn w:val="ListBase"/></w:style>'
+    '<w:style w:type="character" w:styleId="Emphasis"><w:pPr><w:numPr><w:numId w:val="1"/></w:numPr></w:pPr></w:style>'
+)
+
+
+def test_manuscript_yields_only_the_reference_list():
+    prose = [
+        "Layered oxides for sodium-ion batteries",
+        "Sodium-ion batteries are considered a low-cost alternative to lithium-ion cells for stationary storage, "
+        "and layered transition-metal oxides are among the most studied positive electrode materials.",
+        "In this work we compare the cycling stability of several compositions and discuss the role of "
+        "the interlayer spacing in the diffusion of sodium ions.",
+        "References",
+    ]
+    source = make_docx(''.join(paragraph(text) for text in prose + REFERENCES[:4]))
+
+    references, paragraph_count = extract_docx_references(source)
+
+    assert references == REFERENCES[:4]
+    assert paragraph_count == len(prose) + 4
+
+
+def test_reference_list_document_is_returned_whole():
+    source = make_docx(''.join(paragraph(text) for text in [''] + REFERENCES[:4]))
+
+    assert extract_docx_references(source) == (REFERENCES[:4], 4)
+
+
+def test_paragraph_text_matches_previous_path():
+    source = make_docx(RUNS_BODY)
+    texts = list(docx_reader.iter_paragraphs(source))
+
+    assert texts == legacy_paragraph_texts(source)
+    assert texts == ['Smith J., Polymer electrolytes\t//\nJ. Power Sources',
+                     'See https://doi.org/10.1/x and co-workers.', '']
+
+
+@pytest.mark.skipif(not app_import._installed('docx'), reason="python-docx is not installed")
+def test_paragraph_text_matches_python_docx():
+    source = make_docx(RUNS_BODY)
+    assert list(docx_reader.iter_paragraphs(source)) == python_docx_texts(source)
+
+
+def test_direct_numbering_labels():
+    body = (numbered('Alpha', '1', '0') + numbered('Alpha sub', '1', '1') + numbered('Alpha sub two', '1', '1')
+            + numbered('Beta', '1', '0') + numbered('Bracketed', '2'))
+    source = make_docx(body, NUMBERING)
+
+    texts = list(docx_reader.iter_paragraphs(source))
+
+    assert texts == ['1. Alpha', '1.a Alpha sub', '1.b Alpha sub two', '2. Beta', '[1] Bracketed']
+    # The previous path had the same text without the list labels
+    assert [text.split(' ', 1)[1] for text in texts] == legacy_paragraph_texts(source)
+
+
+def test_numbering_from_paragraph_style():
+    body = (numbered('Inherited', style='Bibliography') + numbered('Own style', style='ListBase')
+            + numbered('Direct wins', '1', style='Bibliography') + numbered('Removed', '0', style='Bibliography')
+            + numbered('Plain') + numbered('Level only', ilvl='0', style='Bibliography'))
+    source = make_docx(body, NUMBERING, STYLES)
+
+    assert list(docx_reader.iter_paragraphs(source)) == [
+        '[1] Inherited', '[2] Own style', '1. Direct wins', 'Removed', 'Plain', '[3] Level only'
+    ]
+
+
+def test_level_overrides():
+    body = (numbered('Restarted', '3') + numbered('Continued', '3')
+            + numbered('Redefined', '4') + numbered('Redefined next', '4') + numbered('Other list', '1'))
+    source = make_docx(body, NUMBERING)
+
+    assert list(docx_reader.iter_paragraphs(source)) == [
+        '5. Restarted', '6. Continued', '(II) Redefined', '(III) Redefined next', '1. Other list'
+    ]
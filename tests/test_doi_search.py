@@ -0,0 +1,54 @@
+import pytest
+
+import app
+from app import DOIProcessor
+
+REFERENCE = "LeCun Y., Bengio Y., Hinton G. Deep learning // Nature. 2015. V. 521, № 7553. P. 436–444."
+
+
+def candidate(doi, title, year, family):
+    return {'DOI': doi, 'title': [title], 'issued': {'date-parts': [[year]]}, 'author': [{'family': family}]}
+
+
+MATCH = candidate('10.1038/nature14539', 'Deep learning', 2015, 'LeCun')
+OTHER = candidate('10.1000/other', 'Protein measurement with the Folin phenol reagent', 1951, 'Lowry')
+WEAK = candidate('10.1038/nature14539', 'Deep learning in neural networks: an overview', 2015, 'Schmidhuber')
+
+
+@pytest.fixture
+def processor(tmp_path):
+    processor = DOIProcessor()
+    processor.cache = app.DOICache(str(tmp_path / "doi_cache.db"))
+    return processor
+
+
+def search(processor, monkeypatch, crossref, openalex):
+    monkeypatch.setattr(processor, '_find_bibliographic_candidate', lambda reference, deadline=None: crossref)
+    monkeypatch.setattr(processor, '_find_openalex_candidate', lambda reference, deadline=None: openalex)
+    return processor.find_doi_by_search(REFERENCE)
+
+
+def test_confidence_counts_title_year_and_author():
+    assert abs(DOIProcessor._candidate_confidence(REFERENCE, MATCH) - 1.0) < 1e-9
+    assert DOIProcessor._candidate_confidence(REFERENCE, OTHER) == 0.0
+
+
+def test_crossref_match_is_preferred(processor, monkeypatch):
+    openalex = candidate('10.1000/openalex', 'Deep learning', 2015, 'LeCun')
+    assert search(processor, monkeypatch, MATCH, openalex) == '10.1038/nature14539'
+
+
+def test_openalex_is_used_when_crossref_has_no_match(processor, monkeypatch):
+    assert search(processor, monkeypatch, OTHER, MATCH) == '10.1038/nature14539'
+    assert search(processor, monkeypatch, None, MATCH) == '10.1038/nature14539'
+
+
+def test_agreement_accepts_weak_candidates(processor, monkeypatch):
+    assert DOIProcessor._candidate_confidence(REFERENCE, WEAK) < app.Config.DOI_MIN_MATCH
+    assert search(processor, monkeypatch, WEAK, None) is None
+    assert search(processor, monkeypatch, WEAK, WEAK) == '10.1038/nature14539'
+
+
+def test_rejected_candidates_are_not_cached(processor, monkeypatch):
+    assert search(processor, monkeypatch, OTHER, OTHER) is None
+    assert processor.cache.get_reference_doi(REFERENCE) is None
@@ -0,0 +1,14 @@
+from app import find_duplicate_references
+
+
+def test_duplicates_are_matched_by_doi():
+    formatted_refs = [
+        ([], False, {'doi': '10.1000/ABC', 'title': 'First'}),
+        ([], False, {'doi': '10.1000/xyz', 'title': 'Second'}),
+        ([], True, None),
+        ([], False, {'doi': 'https://doi.org/10.1000/abc', 'title': 'First, reprinted'}),
+        ([], False, {'title': 'No DOI'}),
+        ([], False, {'title': 'No DOI'}),
+    ]
+
+    assert find_duplicate_references(formatted_refs) == {3: 0}
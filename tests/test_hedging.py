@@ -0,0 +1,39 @@
+import threading
+import time
+
+from app import DOIProcessor, JobDeadline, LatencyTracker
+
+
+def test_cold_tracker_hedges_after_default_delay(monkeypatch):
+    monkeypatch.setattr('app.Config.HEDGE_DEFAULT_DELAY', 0.05)
+    release = threading.Event()
+    processor = DOIProcessor()
+
+    def slow_primary():
+        release.wait(2)
+        return {'source': 'crossref'}
+
+    try:
+        result = processor._hedged(slow_primary, lambda: {'source': 'openalex'}, LatencyTracker())
+    finally:
+        release.set()
+
+    assert result == {'source': 'openalex'}
+
+
+def test_cold_tracker_respects_job_deadline():
+    release = threading.Event()
+    processor = DOIProcessor()
+
+    def slow():
+        release.wait(2)
+        return None
+
+    started = time.monotonic()
+    try:
+        result = processor._hedged(slow, slow, LatencyTracker(), JobDeadline(0.1))
+    finally:
+        release.set()
+
+    assert result is None
+    assert time.monotonic() - started < 1
@@ -0,0 +1,102 @@
+import re
+
+import pytest
+
+from app import Config, reference_scanner
+
+LONG_AUTHOR_LIST = ', '.join(f"{family} {initials}" for family, initials in [
+    ('Aad', 'G.'), ('Abajyan', 'T.'), ('Abbott', 'B.'), ('Abdallah', 'J.'), ('Abdel Khalek', 'S.'),
+    ('Abdelalim', 'A.A.'), ('Abdinov', 'O.'), ('Aben', 'R.'), ('Abi', 'B.'), ('Abolins', 'M.'),
+    ('AbouZeid', 'O.S.'), ('Abramowicz', 'H.'), ('Abreu', 'H.'), ('Acharya', 'B.S.'), ('Adamczyk', 'L.'),
+    ('Adams', 'D.L.'), ('Addy', 'T.N.'), ('Adelman', 'J.'), ('Adomeit', 'S.'), ('Adragna', 'P.'),
+    ('Adye', 'T.'), ('Aefsky', 'S.'), ('Aguilar-Saavedra', 'J.A.'), ('Agustoni', 'M.'), ('Aharrouche', 'M.'),
+    ('Ahlen', 'S.P.'), ('Ahles', 'F.'), ('Ahmad', 'A.'), ('Ahsan', 'M.'), ('Aielli', 'G.'),
+    ('Akesson', 'T.P.A.'), ('Akimoto', 'G.'), ('Akimov', 'A.V.'), ('Alam', 'M.A.'), ('Albert', 'J.'),
+    ('Albrand', 'S.'), ('Aleksa', 'M.'), ('Aleksandrov', 'I.N.'), ('Alessandria', 'F.'), ('Alexa', 'C.'),
+])
+LONG_REFERENCE = (f"{LONG_AUTHOR_LIST} et al. Observation of a new particle in the search for the Standard Model "
+                  f"Higgs boson with the ATLAS detector at the LHC // Physics Letters B. 2012. V. 716, № 1. P. 1–29.")
+BOOK_REFERENCE = "Bard A.J., Faulkner L.R. Electrochemical Methods: Fundamentals and Applications. New York: Wiley, 2001. 864 p."
+CONFERENCE_REFERENCE = ("He K., Zhang X., Ren S., Sun J. Deep residual learning for image recognition // Proceedings of "
+                        "the IEEE Conference on Computer Vision and Pattern Recognition. Las Vegas, 2016. P. 770–778.")
+CYRILLIC_REFERENCE = "Иванов И.И., Петров П.П. Синтез слоистых оксидов // Журнал неорганической химии. 2019. Т. 64, № 5. С. 510–518."
+WEB_REFERENCE = ("World Health Organization. Global tuberculosis report 2023. "
+                 "URL: https://www.who.int/publications/i/item/9789240083851 (accessed 15.01.2024).")
+
+
+def legacy_find_explicit_doi(reference):
+    """DOIProcessor._find_explicit_doi before ReferenceScanner"""
+    doi_patterns = [
+        r'https?://doi\.org/(10\.\d{4,9}/[-._;()/:A-Za-z0-9]+)',
+        r'doi:\s*(10\.\d{4,9}/[-._;()/:A-Za-z0-9]+)',
+        r'DOI:\s*(10\.\d{4,9}/[-._;()/:A-Za-z0-9]+)',
+        r'\b(10\.\d{4,9}/[-._;()/:A-Za-z0-9]+)\b'
+    ]
+    for pattern in doi_patterns:
+        match = re.search(pattern, reference, re.IGNORECASE)
+        if match:
+            return match.group(1).rstrip('.,;:')
+    return None
+
+
+def legacy_is_section_header(text):
+    """DOIProcessor._is_section_header before ReferenceScanner"""
+    text_upper = text.upper().strip()
+    section_patterns = [
+        r'^NOTES?\s+AND\s+REFERENCES?$', r'^REFERENCES?$', r'^BIBLIOGRAPHY$', r'^LITERATURE$',
+        r'^WORKS?\s+CITED$', r'^SOURCES?$', r'^CHAPTER\s+\d+$', r'^SECTION\s+\d+$', r'^PART\s+\d+$'
+    ]
+    return any(re.search(pattern, text_upper) for pattern in section_patterns)
+
+
+@pytest.mark.parametrize('reference', [LONG_REFERENCE, BOOK_REFERENCE, CONFERENCE_REFERENCE,
+                                       CYRILLIC_REFERENCE, WEB_REFERENCE],
+                         ids=['long', 'book', 'conference', 'cyrillic', 'web'])
+def test_references_without_doi_are_sent_to_search(reference):
+    assert reference_scanner.classify(reference) == ('none', None)
+
+
+def test_long_reference_is_searched():
+    assert len(LONG_REFERENCE) > reference_scanner.LONG_PARAGRAPH_LENGTH
+    assert reference_scanner.is_search_candidate(LONG_REFERENCE)
+
+
+@pytest.mark.parametrize('text', [
+    "Figure 3. SEM images of the LiCoO2 cathode after 100 cycles.",
+    "Acknowledgements. The authors thank the staff of the analytical center for XRD measurements.",
+    "Funding: this research received no external funding.",
+    "The authors declare no conflict of interest.",
+    "Рис. 2. Зависимость емкости от числа циклов.",
+    "Short line.",
+    "See the discussion in the next section for more details on this.",
+])
+def test_paragraphs_without_bibliographic_signals_skip_search(text):
+    assert reference_scanner.classify(text) == ('not_reference', None)
+
+
+def test_search_threshold_is_below_list_threshold():
+    assert Config.REFERENCE_SEARCH_MIN_SCORE < Config.REFERENCE_SCORE_THRESHOLD
+
+
+@pytest.mark.parametrize('text', [
+    "Smith J. Title. J. Chem. 2020, 1, 2. https://doi.org/10.1021/ja3091438.",
+    "Smith J. Title. J. Chem. 2020, 1, 2. doi:10.1021/ja3091438; see also 10.1038/nature14539",
+    "Smith J. Title. 10.1038/nature14539 and https://doi.org/10.1021/ja3091438",
+    "Smith J. Title. DOI: 10.1103/PhysRevB.54.11169,",
+    "Smith J. Title. doi: 10.1016/S0021-9258(19)52451-6.",
+    "10.1063/1.3382344",
+    "doi:10.1126/science.1102896",
+    "Watson J.D., Crick F.H.C. Molecular structure of nucleic acids. Nature 1953, 171, 737-738.",
+    "REFERENCES",
+    "  Notes and References ",
+    "Chapter 12",
+    "Works cited",
+    "Literature review",
+])
+def test_classify_matches_legacy_helpers(text):
+    kind, doi = reference_scanner.classify(text)
+    assert (kind == 'header') == legacy_is_section_header(text)
+    assert reference_scanner.is_section_header(text) == legacy_is_section_header(text)
+    if kind != 'header':
+        assert doi == legacy_find_explicit_doi(text)
+        assert reference_scanner.find_explicit_doi(text) == legacy_find_explicit_doi(text)
@@ -0,0 +1,149 @@
+import random
+
+import pytest
+
+import app
+from app import RenderedReference, style_compiler
+from format_many import PRESET_FLAGS, make_records, style_config
+
+VALUES = ['Smith, J.', 'Polymer electrolytes', 'J. Power Sources', '2020', '450', '227–235', 'ends.', '', '10.1/x']
+SEPARATORS = ['. ', ', ', ' // ', ' ', '', None]
+
+
+def legacy_markdown(elements, final_punctuation):
+    """ReferenceProcessor._format_reference_for_text before RenderedReference"""
+    ref_str = ""
+    for i, (value, italic, bold, separator, is_doi_hyperlink, doi_value) in enumerate(elements):
+        if italic and bold:
+            ref_str += f"***{value}***"
+        elif italic:
+            ref_str += f"*{value}*"
+        elif bold:
+            ref_str += f"**{value}**"
+        else:
+            ref_str += value
+        if separator and i < len(elements) - 1:
+            ref_str += separator
+    if final_punctuation and not ref_str.endswith('.'):
+        ref_str += "."
+    return ref_str
+
+
+def legacy_html(elements):
+    """Results page element loop before RenderedReference"""
+    html_parts = []
+    for j, (value, italic, bold, separator, is_doi_hyperlink, doi_value) in enumerate(elements):
+        if italic and bold:
+            format_class = "formatted-text-italic-bold"
+        elif italic:
+            format_class = "formatted-text-italic"
+        elif bold:
+            format_class = "formatted-text-bold"
+        else:
+            format_class = ""
+        html_parts.append(f'<span class="{format_class}">{value}</span>' if format_class else value)
+        if separator and j < len(elements) - 1:
+            html_parts.append(separator)
+    return "".join(html_parts)
+
+
+def legacy_docx(para, elements, highlight):
+    """DocumentGenerator element loop before RenderedReference"""
+    for j, (value, italic, bold, separator, is_doi_hyperlink, doi_value) in enumerate(elements):
+        if is_doi_hyperlink and doi_value:
+            app.DocumentGenerator.add_hyperlink(para, value, f"https://doi.org/{doi_value}")
+        else:
+            run = para.add_run(value)
+            if italic:
+                run.font.italic = True
+            if bold:
+                run.font.bold = True
+            if highlight:
+                highlight(run)
+        if separator and j < len(elements) - 1:
+            para.add_run(separator)
+
+
+class FakeFont:
+    italic = None
+    bold = None
+
+
+class FakeRun:
+    def __init__(self, text):
+        self.text = text
+        self.font = FakeFont()
+        self.highlighted = False
+
+
+class FakeParagraph:
+    """Records runs and hyperlinks as comparable tuples"""
+
+    def __init__(self):
+        self.runs = []
+
+    def add_run(self, text):
+        run = FakeRun(text)
+        self.runs.append(run)
+        return run
+
+    def add_hyperlink(self, text, url):
+        self.runs.append(('link', text, url))
+
+    def record(self):
+        return [run if isinstance(run, tuple) else (run.text, run.font.italic, run.font.bold, run.highlighted)
+                for run in self.runs]
+
+
+def mark(run):
+    run.highlighted = True
+
+
+@pytest.fixture(autouse=True)
+def fake_hyperlinks(monkeypatch):
+    monkeypatch.setattr(app.DocumentGenerator, 'add_hyperlink',
+                        staticmethod(lambda para, text, url: para.add_hyperlink(text, url)))
+
+
+def random_elements(rng):
+    elements = []
+    for _ in range(rng.randint(1, 8)):
+        is_link = rng.random() < 0.2
+        elements.append((rng.choice(VALUES), rng.random() < 0.4, rng.random() < 0.3, rng.choice(SEPARATORS),
+                         is_link, rng.choice(['10.1/x', '', None]) if is_link else None))
+    return elements
+
+
+def formatter_elements():
+    """Element lists produced by the real formatters for every preset and a custom style"""
+    cases = []
+    for preset in (None,) + PRESET_FLAGS:
+        formatter = style_compiler.compile(style_config(preset))
+        for record in make_records(8, seed=7):
+            elements, is_error = formatter.format_reference(record, False)
+            if not is_error and not isinstance(elements, str):
+                cases.append(elements)
+    return cases
+
+
+FORMATTER_CASES = formatter_elements()
+ELEMENT_CASES = FORMATTER_CASES + [random_elements(random.Random(seed)) for seed in range(300)]
+
+
+@pytest.mark.parametrize('elements', ELEMENT_CASES)
+def test_serializers_match_legacy_loops(elements):
+    rendered = RenderedReference.from_elements(elements)
+
+    assert rendered.to_markdown() == legacy_markdown(elements, False)
+    assert rendered.to_markdown(True) == legacy_markdown(elements, True)
+    assert rendered.to_html() == legacy_html(elements)
+
+    for highlight in (None, mark):
+        expected, actual = FakeParagraph(), FakeParagraph()
+        legacy_docx(expected, elements, highlight)
+        rendered.add_to_paragraph(actual, highlight)
+        assert actual.record() == expected.record()
+
+
+def test_every_style_formats_the_sample_records():
+    assert len(FORMATTER_CASES) == (len(PRESET_FLAGS) + 1) * 8
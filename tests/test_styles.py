@@ -0,0 +1,38 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app import BatchFormatter, format_many, style_definitions
+from format_many import PRESET_FLAGS, as_text, make_records, style_config
+
+# Produced by the hand-coded preset formatter classes these definitions replaced
+FIXTURES = json.loads((Path(__file__).resolve().parent / "fixtures" / "preset_references.json").read_text(encoding='utf-8'))
+
+
+def test_every_preset_has_a_definition():
+    assert set(style_definitions.flags) == set(PRESET_FLAGS)
+    assert set(FIXTURES['expected']) == set(PRESET_FLAGS)
+
+
+@pytest.mark.parametrize('preset', PRESET_FLAGS)
+def test_preset_output_matches_previous_formatters(preset):
+    config = style_config(preset)
+    results = format_many(FIXTURES['records'], config)
+
+    actual = [rendered if isinstance(rendered, str) else rendered.to_markdown(config.get('final_punctuation'))
+              for rendered, _ in results]
+    assert actual == FIXTURES['expected'][preset]
+    assert not any(is_error for _, is_error in results)
+
+
+def test_batches_below_the_process_threshold_stay_in_process(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("process pool started")
+
+    monkeypatch.setattr('app.concurrent.futures.ProcessPoolExecutor', no_pool)
+    records = make_records(30)
+    config = style_config('gost_style')
+    formatter = BatchFormatter(chunk_size=4, process_threshold=31, max_workers=4)
+
+    assert as_text(formatter.format_many(records, config)) == as_text(format_many(records, config, processes=1))
@@ -0,0 +1,31 @@
+import pytest
+
+from app import TextNormalizer
+from text_normalizer import legacy_clean_text, legacy_normalize_name, load_fixtures
+
+SAMPLES = load_fixtures()
+EDGE_TEXTS = ['', '   ', 'A', 'x\r\ny', '&amp;&nbsp;&unknown;', '<SUB>2</SUB> and <sub>2</sub>',
+              'THE EFFECT OF HEAT VS. COLD ON A SAMPLE ETC. AND SO ON', '<scp>dna</scp> repair']
+EDGE_NAMES = ['', 'a', 'O', "o'neil", 'GARCÍA-LÓPEZ', 'd’arcy', '-smith', "van't hoff", 'ab--cd']
+
+
+@pytest.fixture
+def normalizer():
+    return TextNormalizer()
+
+
+@pytest.mark.parametrize('text', SAMPLES['title'] + SAMPLES['journal'] + EDGE_TEXTS)
+def test_clean_text_matches_legacy(normalizer, text):
+    expected = legacy_clean_text(text)
+    assert normalizer._clean_text(text) == expected
+    assert normalizer.clean_text(text) == expected
+    # Memoized result is returned unchanged on the second call
+    assert normalizer.clean_text(text) == expected
+
+
+@pytest.mark.parametrize('name', SAMPLES['name'] + EDGE_NAMES)
+def test_normalize_name_matches_legacy(normalizer, name):
+    expected = legacy_normalize_name(name)
+    assert normalizer._normalize_name(name) == expected
+    assert normalizer.normalize_name(name) == expected
+    assert normalizer.normalize_name(name) == expected